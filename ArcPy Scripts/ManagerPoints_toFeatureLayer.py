@@ -1,9 +1,44 @@
 import arcpy
+import numpy as np
 import os
 import zipfile
 import tempfile
 import shutil
 import datetime
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    from lxml import etree  # streaming KML parsing in C
+except ImportError:
+    import xml.etree.ElementTree as etree
+
+try:
+    import ijson  # optional: stream GeoJSON to check geometry type before converting
+except ImportError:
+    ijson = None
+
+# Lock serializing writes into the shared target geodatabase (set in each worker)
+_gdb_lock = None
+
+# Spatial data file extensions picked up in reserve folders
+_SPATIAL_EXTS = ('.kmz', '.kml', '.shp', '.geojson', '.json', '.gpx', '.gdb')
+
+# Shape type per (workspace, feature class), filled on first lookup by get_point_feature_classes
+_SHAPE_CACHE = {}
+
+# Copy buffer reused for every KMZ extraction in this process
+_COPY_BUF = bytearray(1 << 20)
+
+# KML namespace
+_KML_NS = {'kml': 'http://www.opengis.net/kml/2.2'}
+_KML_PLACEMARK = '{http://www.opengis.net/kml/2.2}Placemark'
+# lxml can filter Placemark end events itself; the stdlib parser needs the check in the loop
+_PLACEMARK_EVENTS = {'tag': _KML_PLACEMARK} if hasattr(etree, 'LXML_VERSION') else {}
+
+# WGS84 spatial reference, built on first use by _wgs84
+_WGS84 = None
 
 def import_spatial_data_to_gdb():
     """
@@ -23,80 +58,137 @@ def import_spatial_data_to_gdb():
         print(f"Error: Target geodatabase does not exist: {target_gdb}")
         return
     
-    # Set workspace
-    arcpy.env.workspace = target_gdb
     arcpy.env.overwriteOutput = True
     
-    # Create temporary directory for file processing
+    # Get all subdirectories (reserve folders)
+    reserve_folders = [f for f in os.listdir(source_folder) 
+                      if os.path.isdir(os.path.join(source_folder, f))]
+    
+    if not reserve_folders:
+        print("No reserve folders found in source directory")
+        return
+    
+    print(f"Found {len(reserve_folders)} reserve folders")
+    
+    successful_imports = 0
+    failed_imports = []
+    
+    # Process reserve folders in parallel; each worker converts into its own
+    # scratch geodatabase and only the final copy into target_gdb is serialized
+    gdb_lock = multiprocessing.Lock()
+    # Windows caps a process pool at 61 workers; no point starting more than one per reserve
+    max_workers = min(61, os.cpu_count() or 1, len(reserve_folders))
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(gdb_lock,)) as executor:
+        futures = {executor.submit(_process_reserve, reserve_folder, source_folder, target_gdb): reserve_folder
+                   for reserve_folder in reserve_folders}
+        
+        for future in as_completed(futures):
+            try:
+                reserve_successes, reserve_failures = future.result()
+            except Exception as e:
+                print(f"  Error processing reserve {futures[future]}: {str(e)}")
+                failed_imports.append(f"{futures[future]} - {str(e)}")
+                continue
+            
+            successful_imports += reserve_successes
+            failed_imports.extend(reserve_failures)
+    
+    # Print summary
+    print(f"\n{'='*50}")
+    print(f"IMPORT SUMMARY")
+    print(f"{'='*50}")
+    print(f"Successful imports: {successful_imports}")
+    print(f"Failed imports: {len(failed_imports)}")
+    
+    if failed_imports:
+        print(f"\nFailed imports:")
+        for failure in failed_imports:
+            print(f"  - {failure}")
+
+def _init_worker(gdb_lock):
+    """
+    Set up arcpy state and the shared target geodatabase lock in a worker process
+    """
+    global _gdb_lock
+    _gdb_lock = gdb_lock
+    arcpy.env.overwriteOutput = True
+    disable_gp_logging()
+
+def disable_gp_logging():
+    """
+    Skip geoprocessing history and metadata logging, a fixed cost on every tool call
+    """
+    arcpy.SetLogHistory(False)
+    if hasattr(arcpy, "SetLogMetadata"):  # ArcGIS Pro 3.x
+        arcpy.SetLogMetadata(False)
+
+def _process_reserve(reserve_folder, source_folder, target_gdb):
+    """
+    Import the spatial files of one reserve folder (runs in a worker process)
+    
+    Returns (successful_count, failed_list)
+    """
+    reserve_path = os.path.join(source_folder, reserve_folder)
+    print(f"\nProcessing reserve: {reserve_folder}")
+    
+    successful_imports = 0
+    failed_imports = []
+    # Source of the reserve's feature class; every import overwrites it, so
+    # metadata fields are only populated once for the file that ends up in it
+    last_imported = None
+    
+    # Find spatial data files in the reserve folder (.gdb entries are folders)
+    spatial_files = [file for file in os.listdir(reserve_path)
+                     if file.lower().endswith(_SPATIAL_EXTS)]
+    
+    if not spatial_files:
+        print(f"  No spatial data files found in {reserve_folder}")
+        failed_imports.append(f"{reserve_folder} - No spatial data files found")
+        return successful_imports, failed_imports
+    
+    print(f"  Found spatial files: {spatial_files}")
+    
+    # Create temporary directory and scratch geodatabase for this reserve, so
+    # conversions never write to the shared target geodatabase directly
     temp_dir = tempfile.mkdtemp()
     
     try:
-        # Get all subdirectories (reserve folders)
-        reserve_folders = [f for f in os.listdir(source_folder) 
-                          if os.path.isdir(os.path.join(source_folder, f))]
-        
-        if not reserve_folders:
-            print("No reserve folders found in source directory")
-            return
-        
-        print(f"Found {len(reserve_folders)} reserve folders")
-        
-        successful_imports = 0
-        failed_imports = []
+        arcpy.management.CreateFileGDB(temp_dir, "scratch.gdb")
+        scratch_gdb = os.path.join(temp_dir, "scratch.gdb")
         
-        # Process each reserve folder
-        for reserve_folder in reserve_folders:
-            reserve_path = os.path.join(source_folder, reserve_folder)
-            print(f"\nProcessing reserve: {reserve_folder}")
+        # Process each spatial file in the reserve folder
+        for spatial_file in spatial_files:
+            spatial_path = os.path.join(reserve_path, spatial_file)
             
-            # Find spatial data files in the reserve folder
-            spatial_extensions = ['.kmz', '.kml', '.shp', '.geojson', '.json', '.gpx', '.gdb']
-            spatial_files = []
-            
-            for file in os.listdir(reserve_path):
-                file_lower = file.lower()
-                for ext in spatial_extensions:
-                    if file_lower.endswith(ext):
-                        spatial_files.append(file)
-                        break
-            
-            if not spatial_files:
-                print(f"  No spatial data files found in {reserve_folder}")
-                failed_imports.append(f"{reserve_folder} - No spatial data files found")
-                continue
-            
-            print(f"  Found spatial files: {spatial_files}")
-            
-            # Process each spatial file in the reserve folder
-            for spatial_file in spatial_files:
-                spatial_path = os.path.join(reserve_path, spatial_file)
+            try:
+                # Process different file types
+                success = process_spatial_file(spatial_path, reserve_folder, 
+                                             spatial_file, scratch_gdb, temp_dir)
                 
-                try:
-                    # Process different file types
-                    success = process_spatial_file(spatial_path, reserve_folder, 
-                                                 spatial_file, target_gdb, temp_dir)
+                if success:
+                    successful_imports += 1
+                    last_imported = spatial_file
+                    print(f"  Successfully imported: {spatial_file}")
+                else:
+                    failed_imports.append(f"{reserve_folder}/{spatial_file} - Conversion failed")
                     
-                    if success:
-                        successful_imports += 1
-                        print(f"  Successfully imported: {spatial_file}")
-                    else:
-                        failed_imports.append(f"{reserve_folder}/{spatial_file} - Conversion failed")
-                        
-                except Exception as e:
-                    print(f"  Error processing {spatial_file}: {str(e)}")
-                    failed_imports.append(f"{reserve_folder}/{spatial_file} - {str(e)}")
-        
-        # Print summary
-        print(f"\n{'='*50}")
-        print(f"IMPORT SUMMARY")
-        print(f"{'='*50}")
-        print(f"Successful imports: {successful_imports}")
-        print(f"Failed imports: {len(failed_imports)}")
-        
-        if failed_imports:
-            print(f"\nFailed imports:")
-            for failure in failed_imports:
-                print(f"  - {failure}")
+            except Exception as e:
+                print(f"  Error processing {spatial_file}: {str(e)}")
+                failed_imports.append(f"{reserve_folder}/{spatial_file} - {str(e)}")
+        
+        # Add metadata and copy the reserve's feature class into the target geodatabase
+        if successful_imports:
+            fc_name = clean_feature_class_name(reserve_folder)
+            add_metadata_fields(os.path.join(scratch_gdb, fc_name), reserve_folder, last_imported)
+            try:
+                with _gdb_lock:
+                    arcpy.management.Copy(os.path.join(scratch_gdb, fc_name),
+                                          os.path.join(target_gdb, fc_name))
+            except Exception as e:
+                print(f"  Error copying {fc_name} to target geodatabase: {str(e)}")
+                failed_imports.append(f"{reserve_folder} - Copy to target failed: {str(e)}")
+                successful_imports = 0
     
     finally:
         # Clean up temporary directory
@@ -104,6 +196,8 @@ def import_spatial_data_to_gdb():
             shutil.rmtree(temp_dir)
         except:
             pass
+    
+    return successful_imports, failed_imports
 
 def process_spatial_file(file_path, reserve_name, original_filename, target_gdb, temp_dir):
     """
@@ -167,9 +261,8 @@ def extract_kmz_to_kml(kmz_path, temp_dir):
             kml_filename = kml_files[0]
             kml_path = os.path.join(temp_dir, f"temp_{os.path.basename(kmz_path)}.kml")
             
-            with kmz.open(kml_filename) as kml_file:
-                with open(kml_path, 'wb') as output_file:
-                    output_file.write(kml_file.read())
+            with kmz.open(kml_filename) as kml_file, open(kml_path, 'wb') as output_file:
+                copy_stream(kml_file, output_file)
             
             return kml_path
             
@@ -177,6 +270,17 @@ def extract_kmz_to_kml(kmz_path, temp_dir):
         print(f"    Error extracting KMZ {os.path.basename(kmz_path)}: {str(e)}")
         return None
 
+def copy_stream(source, destination):
+    """
+    Stream a file object into another in 1 MiB chunks through a reused buffer
+    """
+    view = memoryview(_COPY_BUF)
+    while True:
+        n = source.readinto(_COPY_BUF)
+        if not n:
+            break
+        destination.write(view[:n])
+
 def convert_kml_to_fc(kml_path, reserve_name, original_filename, target_gdb, temp_dir):
     """
     Convert KML to feature class in geodatabase, filtering for points only
@@ -204,37 +308,15 @@ def convert_kml_to_fc(kml_path, reserve_name, original_filename, target_gdb, tem
             temp_gdb = os.path.join(kml_output_dir, gdb_files[0])
             print(f"    DEBUG - Examining GDB: {temp_gdb}")
             
-            # Check for feature classes and datasets
-            original_workspace = arcpy.env.workspace
-            arcpy.env.workspace = temp_gdb
+            # Walk lists root feature classes first, then each feature dataset's
+            feature_classes_by_dir = _list_feature_classes(temp_gdb)
             
-            feature_classes = arcpy.ListFeatureClasses()
-            datasets = arcpy.ListDatasets()
-            print(f"    DEBUG - Root feature classes: {feature_classes}")
-            print(f"    DEBUG - Datasets: {datasets}")
-            
-            # Look for point feature classes at root level
-            if feature_classes:
-                point_fcs = get_point_feature_classes(feature_classes, temp_gdb)
+            for dirpath, feature_classes in feature_classes_by_dir.items():
+                print(f"    DEBUG - Feature classes in {dirpath}: {feature_classes}")
+                point_fcs = get_point_feature_classes(feature_classes, dirpath)
                 if point_fcs:
-                    return copy_point_features(point_fcs[0], output_fc, original_workspace, reserve_name, original_filename)
-            
-            # Look for point feature classes in datasets
-            if datasets:
-                for dataset in datasets:
-                    dataset_path = os.path.join(temp_gdb, dataset)
-                    print(f"    DEBUG - Checking dataset: {dataset}")
-                    arcpy.env.workspace = dataset_path
-                    dataset_fcs = arcpy.ListFeatureClasses()
-                    print(f"    DEBUG - Feature classes in {dataset}: {dataset_fcs}")
-                    
-                    if dataset_fcs:
-                        point_fcs = get_point_feature_classes(dataset_fcs, dataset_path)
-                        if point_fcs:
-                            source_fc = os.path.join(temp_gdb, dataset, point_fcs[0])
-                            return copy_point_features(source_fc, output_fc, original_workspace, reserve_name, original_filename)
-            
-            arcpy.env.workspace = original_workspace
+                    source_fc = os.path.join(dirpath, point_fcs[0])
+                    return copy_point_features(source_fc, output_fc)
         else:
             print(f"    DEBUG - No GDB files created, checking for other outputs...")
             lyr_files = [f for f in created_files if f.endswith('.lyr') or f.endswith('.lyrx')]
@@ -249,10 +331,6 @@ def convert_kml_to_fc(kml_path, reserve_name, original_filename, target_gdb, tem
             
     except Exception as e:
         print(f"    Error converting KML to feature class: {str(e)}")
-        try:
-            arcpy.env.workspace = target_gdb
-        except:
-            pass
         return False
 
 def convert_shapefile_to_fc(shp_path, reserve_name, original_filename, target_gdb):
@@ -261,9 +339,9 @@ def convert_shapefile_to_fc(shp_path, reserve_name, original_filename, target_gd
     """
     try:
         # Check geometry type
-        desc = arcpy.Describe(shp_path)
-        if desc.shapeType != "Point":
-            print(f"    Skipping {desc.shapeType} shapefile: {original_filename}")
+        shape_type = arcpy.da.Describe(shp_path)["shapeType"]
+        if shape_type != "Point":
+            print(f"    Skipping {shape_type} shapefile: {original_filename}")
             return False
         
         # Create output feature class name
@@ -273,9 +351,6 @@ def convert_shapefile_to_fc(shp_path, reserve_name, original_filename, target_gd
         # Copy features
         arcpy.management.CopyFeatures(shp_path, output_fc)
         
-        # Add metadata fields
-        add_metadata_fields(output_fc, reserve_name, original_filename)
-        
         return True
         
     except Exception as e:
@@ -287,6 +362,11 @@ def convert_geojson_to_fc(geojson_path, reserve_name, original_filename, target_
     Convert GeoJSON to feature class, filtering for points only
     """
     try:
+        # Skip non-point GeoJSON before paying for the conversion
+        if not _geojson_is_points(geojson_path):
+            print(f"    Skipping non-point GeoJSON: {original_filename}")
+            return False
+        
         # Create output feature class name
         fc_name = clean_feature_class_name(reserve_name)
         output_fc = os.path.join(target_gdb, fc_name)
@@ -295,21 +375,41 @@ def convert_geojson_to_fc(geojson_path, reserve_name, original_filename, target_
         arcpy.conversion.JSONToFeatures(geojson_path, output_fc)
         
         # Check if it contains points
-        desc = arcpy.Describe(output_fc)
-        if desc.shapeType != "Point":
-            print(f"    Skipping {desc.shapeType} GeoJSON: {original_filename}")
+        shape_type = arcpy.da.Describe(output_fc)["shapeType"]
+        if shape_type != "Point":
+            print(f"    Skipping {shape_type} GeoJSON: {original_filename}")
             arcpy.management.Delete(output_fc)
             return False
         
-        # Add metadata fields
-        add_metadata_fields(output_fc, reserve_name, original_filename)
-        
         return True
         
     except Exception as e:
         print(f"    Error converting GeoJSON: {str(e)}")
         return False
 
+def _geojson_is_points(geojson_path):
+    """
+    Check whether a GeoJSON file has any point features, streaming the geometry types
+    
+    Stops at the first Point/MultiPoint, so mixed files (e.g. a reserve boundary
+    polygon followed by points) still import. Returns False only when geometry types
+    were read and none is a point; True when it can't be told (no ijson, Esri JSON,
+    unreadable file) so JSONToFeatures still gets to decide
+    """
+    if ijson is None:
+        return True
+    
+    saw_geometry = False
+    try:
+        with open(geojson_path, 'rb') as f:
+            for geometry_type in ijson.items(f, 'features.item.geometry.type'):
+                if geometry_type in ('Point', 'MultiPoint'):
+                    return True
+                saw_geometry = True
+    except Exception:
+        return True
+    return not saw_geometry
+
 def convert_gpx_to_fc(gpx_path, reserve_name, original_filename, target_gdb, temp_dir):
     """
     Convert GPX to feature class, filtering for points only
@@ -324,11 +424,9 @@ def convert_gpx_to_fc(gpx_path, reserve_name, original_filename, target_gdb, tem
         arcpy.conversion.GPXtoFeatures(gpx_path, gpx_output_dir)
         
         # Look for point feature classes
-        original_workspace = arcpy.env.workspace
-        arcpy.env.workspace = gpx_output_dir
-        feature_classes = arcpy.ListFeatureClasses()
+        fc_dir, feature_classes = _root_feature_classes(gpx_output_dir)
         
-        point_fcs = get_point_feature_classes(feature_classes, gpx_output_dir)
+        point_fcs = get_point_feature_classes(feature_classes, fc_dir)
         
         if point_fcs:
             # Create output feature class name
@@ -336,16 +434,14 @@ def convert_gpx_to_fc(gpx_path, reserve_name, original_filename, target_gdb, tem
             output_fc = os.path.join(target_gdb, fc_name)
             
             # Copy the first point feature class
-            source_fc = os.path.join(gpx_output_dir, point_fcs[0])
-            return copy_point_features(source_fc, output_fc, original_workspace, reserve_name, original_filename)
+            source_fc = os.path.join(fc_dir, point_fcs[0])
+            return copy_point_features(source_fc, output_fc)
         else:
             print(f"    No point features found in GPX: {original_filename}")
-            arcpy.env.workspace = original_workspace
             return False
         
     except Exception as e:
         print(f"    Error converting GPX: {str(e)}")
-        arcpy.env.workspace = target_gdb
         return False
 
 def convert_gdb_to_fc(gdb_path, reserve_name, original_filename, target_gdb):
@@ -353,13 +449,9 @@ def convert_gdb_to_fc(gdb_path, reserve_name, original_filename, target_gdb):
     Convert features from file geodatabase, filtering for points only
     """
     try:
-        # Set workspace to source geodatabase
-        original_workspace = arcpy.env.workspace
-        arcpy.env.workspace = gdb_path
-        
-        # Get all feature classes
-        feature_classes = arcpy.ListFeatureClasses()
-        point_fcs = get_point_feature_classes(feature_classes, gdb_path)
+        # Get all feature classes at the geodatabase root
+        fc_dir, feature_classes = _root_feature_classes(gdb_path)
+        point_fcs = get_point_feature_classes(feature_classes, fc_dir)
         
         if point_fcs:
             # Create output feature class name
@@ -367,18 +459,46 @@ def convert_gdb_to_fc(gdb_path, reserve_name, original_filename, target_gdb):
             output_fc = os.path.join(target_gdb, fc_name)
             
             # Copy the first point feature class
-            source_fc = os.path.join(gdb_path, point_fcs[0])
-            return copy_point_features(source_fc, output_fc, original_workspace, reserve_name, original_filename)
+            source_fc = os.path.join(fc_dir, point_fcs[0])
+            return copy_point_features(source_fc, output_fc)
         else:
             print(f"    No point features found in geodatabase: {original_filename}")
-            arcpy.env.workspace = original_workspace
             return False
         
     except Exception as e:
         print(f"    Error converting geodatabase: {str(e)}")
-        arcpy.env.workspace = target_gdb
         return False
 
+def _list_feature_classes(workspace, root_only=False):
+    """
+    List feature classes under a workspace without describing them or touching arcpy.env.workspace
+    
+    Returns {dirpath: [feature class names]} in walk order (the root, then each feature
+    dataset); with root_only the walk stops after the root, so datasets are never opened
+    """
+    # Drop stale shape types in case a temp workspace is reused for another file
+    for key in [k for k in _SHAPE_CACHE if k[0].startswith(workspace)]:
+        del _SHAPE_CACHE[key]
+    
+    feature_classes_by_dir = {}
+    try:
+        for dirpath, _, names in arcpy.da.Walk(workspace, datatype="FeatureClass"):
+            if names:
+                feature_classes_by_dir[dirpath] = names
+            if root_only:
+                break
+    except Exception as e:
+        print(f"    Could not scan workspace {workspace}: {str(e)}")
+    return feature_classes_by_dir
+
+def _root_feature_classes(workspace):
+    """
+    Return (dirpath, [feature class names]) for the feature classes at the workspace root
+    """
+    for dirpath, names in _list_feature_classes(workspace, root_only=True).items():
+        return dirpath, names
+    return workspace, []
+
 def get_point_feature_classes(feature_classes, workspace):
     """
     Filter feature classes to return only point geometry
@@ -386,28 +506,29 @@ def get_point_feature_classes(feature_classes, workspace):
     point_fcs = []
     for fc in feature_classes:
         try:
-            desc = arcpy.Describe(os.path.join(workspace, fc))
-            if desc.shapeType == "Point":
+            shape_type = _SHAPE_CACHE.get((workspace, fc))
+            if shape_type is None:
+                shape_type = arcpy.da.Describe(os.path.join(workspace, fc))["shapeType"]
+                _SHAPE_CACHE[(workspace, fc)] = shape_type
+            
+            if shape_type == "Point":
                 point_fcs.append(fc)
                 print(f"    Found point feature class: {fc}")
             else:
-                print(f"    Skipping {desc.shapeType} feature class: {fc}")
+                print(f"    Skipping {shape_type} feature class: {fc}")
         except:
             print(f"    Could not describe feature class: {fc}")
     return point_fcs
 
-def copy_point_features(source_fc, output_fc, original_workspace, reserve_name, original_filename):
+def copy_point_features(source_fc, output_fc):
     """
-    Copy point features and add metadata
+    Copy point features
     """
     try:
-        arcpy.env.workspace = original_workspace
         arcpy.management.CopyFeatures(source_fc, output_fc)
-        add_metadata_fields(output_fc, reserve_name, original_filename)
         return True
     except Exception as e:
         print(f"    Error copying features: {str(e)}")
-        arcpy.env.workspace = original_workspace
         return False
 
 def extract_coordinates_from_kml(kml_path, reserve_name, original_filename, target_gdb):
@@ -415,25 +536,20 @@ def extract_coordinates_from_kml(kml_path, reserve_name, original_filename, targ
     Direct extraction of point coordinates from KML when KMLToLayer fails
     """
     try:
-        import xml.etree.ElementTree as ET
-        
-        # Parse the KML file
-        tree = ET.parse(kml_path)
-        root = tree.getroot()
-        
-        # KML namespace
-        ns = {'kml': 'http://www.opengis.net/kml/2.2'}
-        
-        # Find all Point elements
+        # Stream Placemarks so memory follows the largest Placemark, not the file
         points = []
-        for placemark in root.findall('.//kml:Placemark', ns):
-            point_elem = placemark.find('.//kml:Point', ns)
+        for _, placemark in etree.iterparse(kml_path, **_PLACEMARK_EVENTS):
+            if placemark.tag != _KML_PLACEMARK:
+                continue
+            
+            point_elem = placemark.find('.//kml:Point', _KML_NS)
             if point_elem is not None:
-                coords_elem = point_elem.find('kml:coordinates', ns)
+                coords_elem = point_elem.find('kml:coordinates', _KML_NS)
                 if coords_elem is not None:
                     # Get placemark name
-                    name_elem = placemark.find('kml:name', ns)
-                    name = name_elem.text if name_elem is not None else "Unnamed"
+                    name_elem = placemark.find('kml:name', _KML_NS)
+                    # Empty <name/> counts as missing: None would be stored as the text 'None'
+                    name = name_elem.text if name_elem is not None and name_elem.text is not None else "Unnamed"
                     
                     # Parse coordinates (lon,lat,alt format)
                     coords_text = coords_elem.text.strip()
@@ -451,7 +567,13 @@ def extract_coordinates_from_kml(kml_path, reserve_name, original_filename, targ
                                     'alt': alt
                                 })
                         except ValueError:
-                            continue
+                            pass
+            
+            # Free the parsed Placemark (and, with lxml, the emptied siblings before it)
+            placemark.clear()
+            if _PLACEMARK_EVENTS:
+                while placemark.getprevious() is not None:
+                    del placemark.getparent()[0]
         
         if points:
             print(f"    Found {len(points)} points via direct extraction")
@@ -460,25 +582,17 @@ def extract_coordinates_from_kml(kml_path, reserve_name, original_filename, targ
             fc_name = clean_feature_class_name(reserve_name)
             output_fc = os.path.join(target_gdb, fc_name)
             
-            # Create point feature class
-            spatial_ref = arcpy.SpatialReference(4326)  # WGS84
-            arcpy.management.CreateFeatureclass(
-                target_gdb, 
-                fc_name, 
-                "POINT", 
-                spatial_reference=spatial_ref
+            # Build all points as one structured array (Name is a 100 char text field)
+            point_array = np.array(
+                [((point['lon'], point['lat']), point['name']) for point in points],
+                dtype=[('SHAPE', '<f8', 2), ('Name', 'U100')]
             )
             
-            # Add name field
-            arcpy.management.AddField(output_fc, "Name", "TEXT", field_length=100)
-            
-            # Insert points
-            with arcpy.da.InsertCursor(output_fc, ["SHAPE@XY", "Name"]) as cursor:
-                for point in points:
-                    cursor.insertRow([(point['lon'], point['lat']), point['name']])
-            
-            # Add metadata fields
-            add_metadata_fields(output_fc, reserve_name, original_filename)
+            # Create point feature class in a single call instead of a per-row cursor
+            spatial_ref = _wgs84()
+            if arcpy.Exists(output_fc):
+                arcpy.management.Delete(output_fc)
+            arcpy.da.NumPyArrayToFeatureClass(point_array, output_fc, ('SHAPE',), spatial_ref)
             
             return True
         else:
@@ -489,14 +603,33 @@ def extract_coordinates_from_kml(kml_path, reserve_name, original_filename, targ
         print(f"    Direct KML extraction failed: {str(e)}")
         return False
 
+def _wgs84():
+    """
+    Return the WGS84 spatial reference, constructing it once per process
+    """
+    global _WGS84
+    if _WGS84 is None:
+        _WGS84 = arcpy.SpatialReference(4326)
+    return _WGS84
+
+class _NameCharTable(dict):
+    """
+    str.translate table that keeps alphanumerics and underscores, filled lazily per character
+    """
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        self[codepoint] = kept = char if char.isalnum() or char == "_" else None
+        return kept
+
+_NAME_CHARS = _NameCharTable()
+
+@functools.lru_cache(maxsize=1024)
 def clean_feature_class_name(reserve_name):
     """
     Create a clean feature class name from reserve name
     """
-    fc_name = reserve_name
-    
     # Clean feature class name (remove special characters)
-    fc_name = "".join(c for c in fc_name if c.isalnum() or c == "_")
+    fc_name = reserve_name.translate(_NAME_CHARS)
     
     # Ensure it starts with a letter
     if fc_name and fc_name[0].isdigit():
@@ -527,14 +660,16 @@ def add_metadata_fields(feature_class, reserve_name, source_file):
         if "Import_Date" not in field_names:
             arcpy.management.AddField(feature_class, "Import_Date", "DATE")
         
-        # Populate metadata fields
-        with arcpy.da.UpdateCursor(feature_class, 
-                                 ["Reserve_Name", "Source_File", "Import_Date"]) as cursor:
-            for row in cursor:
-                row[0] = reserve_name
-                row[1] = source_file
-                row[2] = datetime.datetime.now()
-                cursor.updateRow(row)
+        # Populate metadata fields in one pass; rows of one import share a timestamp
+        now = datetime.datetime.now()
+        arcpy.management.CalculateFields(
+            feature_class, 
+            "PYTHON3", 
+            [["Reserve_Name", repr(reserve_name)],
+             ["Source_File", repr(source_file)],
+             ["Import_Date", f"datetime.datetime({now.year}, {now.month}, {now.day}, "
+                             f"{now.hour}, {now.minute}, {now.second})"]]
+        )
                 
     except Exception as e:
         print(f"    Warning: Could not add metadata fields: {str(e)}")
@@ -12,51 +12,100 @@ Usage (example):
 
 Modes:
   symlink  (default): make a staged tree using symlinks to save space/time
+                      (hard links instead when staging is on the same filesystem as --input)
   copy                actually copy bytes (uses more space/time)
+  reflink             copy-on-write clone via `cp --reflink=auto` (free on XFS/Btrfs; falls back to copy)
   plan                make directories + inventories only (no files placed)
 
 Outputs (under the staging target):
   - file_inventory.csv  (one row per file with path, device, size, mtime, sha256)
-  - manifest_sha256.txt (sha256  filepath) suitable for 'shasum -c'
+  - manifest_blake3.txt (blake3  filepath) suitable for 'b3sum -c', with --compute-hash
+    (or manifest_sha256.txt for 'shasum -c' with --hash-algo sha256 or when blake3 is not installed)
   - logs/ingest.log     (basic run info)
 
 Notes:
   - This script does not upload; it prints an rsync command you can run after review.
   - Device folders are inferred from immediate subfolders of --input (e.g., camera_01, ARU_01).
+  - With --hash-cache FILE, digests are kept between runs, so re-ingesting unchanged files skips hashing.
+  - --io-backend uring needs Linux and the 2024.x liburing bindings (pip install "liburing<2026");
+    later releases renamed the API used here.
 """
 
 import argparse
 import csv
+import functools
 import hashlib
+import itertools
+import math
+import mmap
 import os
 from pathlib import Path
+import queue
+import re
 import shutil
+import sqlite3
+import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
+try:
+    from blake3 import blake3  # optional: SIMD + multithreaded manifest hashing
+except ImportError:
+    blake3 = None
+
+try:
+    import liburing  # optional: batched io_uring reads for hashing on Linux
+except ImportError:
+    liburing = None
+
 DEVICE_PREFIXES = ("camera_", "aru_", "Camera", "ARU")  # accepted starts (case-insensitive)
 IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".cr2", ".nef", ".arw", ".dng"}
 AUDIO_EXTS = {".wav", ".flac"}
 VIDEO_EXTS = {".mp4", ".mov", ".avi"}
+# Lowercase extension -> media_class, so classifying a file is one dict lookup
+EXT_TO_CLASS = {
+    **dict.fromkeys(IMAGE_EXTS, "image"),
+    **dict.fromkeys(AUDIO_EXTS, "audio"),
+    **dict.fromkeys(VIDEO_EXTS, "video"),
+}
+# camera/aru device folder names ("-" already mapped to "_") and their label prefixes
+DEVICE_LABEL_RE = re.compile(r"(camera|aru)_?(.*)", re.IGNORECASE | re.DOTALL)
+DEVICE_LABEL_PREFIX = {"camera": "CAM", "aru": "ARU"}
+# Inventory CSV columns; rows are tuples in this order
+INVENTORY_FIELDS = (
+    "relative_path", "device_label", "device_type", "media_class",
+    "size_bytes", "mtime_utc", "reserve", "site", "deployment", "source_abspath"
+)
+# Characters that make csv.writer (excel dialect, QUOTE_MINIMAL) quote a field
+NEEDS_QUOTE = re.compile(r'[",\r\n]')
+SMALL_FILE_BYTES = 1 << 20  # files below this are hashed from a single read()
+MMAP_FILE_BYTES = 64 << 20  # files from this size up are memory-mapped for hashing
+READ_BUFSIZE = 1 << 20  # chunk size for files hashed with readinto()
+WRITE_BUFSIZE = 1 << 20  # output buffer for the inventory CSV and manifest
+HASH_QUEUE_DEPTH = 64  # files waiting for a hashing thread before the walk blocks
+HASH_CACHE_BATCH = 1000  # digests written to the --hash-cache database per transaction
+# Filesystems that make up inode numbers at mount time (FAT/exFAT field cards; exFAT
+# via FUSE shows as fuseblk) and reuse them across cards: never trusted by --hash-cache
+UNSTABLE_INODE_FS = {"vfat", "msdos", "fat", "exfat", "fuseblk"}
+URING_DEPTH = 64         # files with a read in flight on the io_uring backend
+URING_BUFSIZE = 1 << 20  # bytes per io_uring read
+# liburing bindings used by hash_files_iouring (the pre-2026 API; newer releases renamed them)
+URING_API = (
+    "io_uring", "io_uring_cqe", "iovec", "io_uring_queue_init", "io_uring_queue_exit",
+    "io_uring_get_sqe", "io_uring_prep_read", "io_uring_sqe_set_data64",
+    "io_uring_submit", "io_uring_wait_cqe", "io_uring_cqe_seen",
+)
 
 def norm_device_label(name: str) -> str:
     """Normalize device folder names to a safe label (e.g., camera_01 → CAM01, ARU_03 → ARU03)."""
     n = name.strip().replace("-", "_")
-    low = n.lower()
-    if low.startswith("camera_"):
-        tail = low.split("camera_")[1]
-        return f"CAM{tail.zfill(2) if tail.isdigit() else tail.upper()}"
-    if low.startswith("aru_"):
-        tail = low.split("aru_")[1]
-        return f"ARU{tail.zfill(2) if tail.isdigit() else tail.upper()}"
-    if low.startswith("camera"):
-        tail = low.split("camera")[1]
-        tail = tail[1:] if tail.startswith("_") else tail
-        return f"CAM{tail.zfill(2) if tail.isdigit() else tail.upper()}"
-    if low.startswith("aru"):
-        tail = low.split("aru")[1]
-        tail = tail[1:] if tail.startswith("_") else tail
-        return f"ARU{tail.zfill(2) if tail.isdigit() else tail.upper()}"
+    m = DEVICE_LABEL_RE.match(n)
+    if m:
+        tail = m.group(2)
+        return DEVICE_LABEL_PREFIX[m.group(1).lower()] + (tail.zfill(2) if tail.isdigit() else tail.upper())
     # fallback
     return n.replace(" ", "_")
 
@@ -66,13 +115,370 @@ def guess_device_type(label: str) -> str:
     if up.startswith("ARU"): return "aru"
     return "unknown"
 
-def sha256_file(path: Path, bufsize: int = 1024 * 1024) -> str:
+# Per-thread read buffer, reused across every file a hashing thread reads
+_read_buf = threading.local()
+
+def update_from_file(h, f):
+    """Feed an open binary file to hasher h in READ_BUFSIZE chunks, without allocating per chunk."""
+    try:
+        buf, view = _read_buf.buf, _read_buf.view
+    except AttributeError:
+        buf = _read_buf.buf = bytearray(READ_BUFSIZE)
+        view = _read_buf.view = memoryview(buf)
+    while True:
+        n = f.readinto(buf)
+        if not n:
+            break
+        h.update(view[:n])
+
+def sha256_stream(f) -> str:
+    """SHA-256 of an open binary file read in chunks (for files that can't be mapped)."""
+    if hasattr(hashlib, "file_digest"):  # Python 3.11+: OpenSSL hashes each chunk in place
+        return hashlib.file_digest(f, "sha256").hexdigest()
+    h = hashlib.sha256()
+    update_from_file(h, f)
+    return h.hexdigest()
+
+def sha256_file(path: str) -> str:
     h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(bufsize), b""):
-            h.update(chunk)
+    with open(path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < SMALL_FILE_BYTES:
+            # Small files (most JPEGs): one read, one update
+            h.update(f.read())
+            return h.hexdigest()
+        if size < MMAP_FILE_BYTES:
+            # Mid-size files (e.g. audio clips): chunked reads into this thread's buffer,
+            # skipping the mmap setup and page-fault cost
+            update_from_file(h, f)
+            return h.hexdigest()
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Some network/FUSE mounts can't be mapped
+            return sha256_stream(f)
+        # Large media: hand the whole mapped file to OpenSSL in one update,
+        # letting kernel readahead page it in
+        with mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            h.update(mm)
     return h.hexdigest()
 
+def blake3_file(path: str) -> str:
+    # Memory-maps the file and hashes it on all cores with BLAKE3's SIMD backend
+    h = blake3(max_threads=blake3.AUTO)
+    h.update_mmap(path)
+    return h.hexdigest()
+
+HASH_FILE_FUNCS = {"sha256": sha256_file, "blake3": blake3_file}
+HASH_CONSTRUCTORS = {"sha256": hashlib.sha256, "blake3": blake3}
+
+def hash_files_threaded(paths, hash_file, workers: int):
+    """Hash files on a thread pool; the hashers release the GIL, so reads and hashing overlap.
+
+    Returns one hex digest (or the exception raised for that file) per path, in order.
+    """
+    def one(path):
+        try:
+            return hash_file(path)
+        except Exception as e:
+            return e
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(one, paths))
+
+def hash_worker(jobs, results, hash_file):
+    """Hash (idx, path) items from the jobs queue into results[idx] until a None arrives."""
+    while True:
+        item = jobs.get()
+        if item is None:
+            return
+        idx, path = item
+        try:
+            results[idx] = hash_file(path)
+        except Exception as e:
+            results[idx] = e
+
+def open_hash_cache(path):
+    """Open the --hash-cache SQLite database of digests from earlier runs, creating it if needed.
+
+    Digests are keyed by source path and algorithm, and are only reused while the
+    file's identity (device, inode), size and mtime_ns are all unchanged.
+    """
+    db = sqlite3.connect(path, isolation_level=None)
+    db.execute("CREATE TABLE IF NOT EXISTS digests (path TEXT, algo TEXT, dev INTEGER, ino INTEGER,"
+               " size INTEGER, mtime_ns INTEGER, digest TEXT, PRIMARY KEY (path, algo))")
+    return db
+
+def cached_digest(db, path: str, stat, algo: str):
+    row = db.execute("SELECT digest FROM digests WHERE path=? AND algo=? AND dev=? AND ino=? AND size=? AND mtime_ns=?",
+                     (path, algo, stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)).fetchone()
+    return row[0] if row else None
+
+def store_digests(db, rows):
+    """Save (path, algo, dev, ino, size, mtime_ns, digest) rows, HASH_CACHE_BATCH per transaction."""
+    for start in range(0, len(rows), HASH_CACHE_BATCH):
+        db.execute("BEGIN")
+        db.executemany("INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       rows[start:start + HASH_CACHE_BATCH])
+        db.execute("COMMIT")
+
+def unescape_mount(field: str) -> str:
+    # /proc/self/mounts writes space, tab, newline and backslash as octal escapes
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), field)
+
+def mount_fstype(path) -> str:
+    """Filesystem type of the mount holding path (e.g. 'vfat', 'apfs'), or '' if unknown."""
+    path = os.path.realpath(path)
+    try:
+        if os.path.exists("/proc/self/mounts"):
+            with open("/proc/self/mounts") as f:
+                mounts = [(unescape_mount(fields[1]), fields[2]) for fields in (line.split() for line in f)
+                          if len(fields) > 2]
+        else:  # macOS/BSD: "<device> on <mount point> (<fstype>, ...)"
+            out = subprocess.run(["mount"], capture_output=True, text=True, check=True).stdout
+            mounts = re.findall(r" on (.+) \(([^,)]+)", out)
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    best, fstype = "", ""
+    for mount_point, fs in mounts:
+        if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) >= len(best):
+            best, fstype = mount_point, fs
+    return fstype
+
+def hash_files_iouring(paths, new_hasher):
+    """Hash files through one io_uring, keeping up to URING_DEPTH files' reads in flight.
+
+    Each file is read sequentially (hashes are order dependent), but reads for
+    different files are batched into the same submission queue. Returns one hex
+    digest (or the exception raised for that file) per path, in order.
+    """
+    results = [None] * len(paths)
+    pending = iter(enumerate(paths))
+    ring = liburing.io_uring()
+    cqe = liburing.io_uring_cqe()
+    bufs = [bytearray(URING_BUFSIZE) for _ in range(min(URING_DEPTH, len(paths)))]
+    iovs = [liburing.iovec(buf) for buf in bufs]
+    slots = [None] * len(bufs)  # per slot: [path index, fd, hasher, offset]
+
+    def queue_read(slot):
+        _, fd, _, offset = slots[slot]
+        sqe = liburing.io_uring_get_sqe(ring)
+        liburing.io_uring_prep_read(sqe, fd, iovs[slot].iov_base, URING_BUFSIZE, offset)
+        liburing.io_uring_sqe_set_data64(sqe, slot)
+
+    def start_next_file(slot):
+        # Give the slot the next file that opens; False once none are left
+        for idx, path in pending:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError as e:
+                results[idx] = e
+                continue
+            slots[slot] = [idx, fd, new_hasher(), 0]
+            queue_read(slot)
+            return True
+        slots[slot] = None
+        return False
+
+    liburing.io_uring_queue_init(URING_DEPTH, ring, 0)
+    try:
+        in_flight = sum(start_next_file(slot) for slot in range(len(slots)))
+        while in_flight:
+            liburing.io_uring_submit(ring)
+            liburing.io_uring_wait_cqe(ring, cqe)
+            slot, res = cqe.user_data, cqe.res
+            liburing.io_uring_cqe_seen(ring, cqe)
+
+            state = slots[slot]
+            idx, fd, h, offset = state
+            if res > 0:
+                h.update(memoryview(bufs[slot])[:res])
+                state[3] = offset + res
+                queue_read(slot)
+                continue
+
+            # EOF (res == 0) or a failed read (res == -errno) finishes this file
+            os.close(fd)
+            slots[slot] = None
+            results[idx] = h.hexdigest() if res == 0 else OSError(-res, os.strerror(-res), str(paths[idx]))
+            if not start_next_file(slot):
+                in_flight -= 1
+    finally:
+        for state in slots:
+            if state is not None:
+                os.close(state[1])
+        liburing.io_uring_queue_exit(ring)
+    return results
+
+def iter_files(path):
+    """Yield os.DirEntry objects for all files under path (no symlinked dirs, like os.walk).
+
+    Entries carry their file type from the directory listing, so the caller
+    avoids a separate stat() just to check is_file().
+    """
+    # Like os.walk, list the whole directory before yielding anything, so a directory
+    # that fails partway (flaky SD card) is dropped as a unit rather than aborting the run
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False  # os.walk also treats these as non-directories
+                if is_dir:
+                    subdirs.append(entry.path)
+                    continue
+                try:
+                    if entry.is_file():
+                        files.append(entry)
+                except OSError:
+                    pass
+    except OSError:
+        return  # unreadable directory: skipped, as os.walk does
+    yield from files
+    for subdir in subdirs:
+        yield from iter_files(subdir)
+
+# Suffix counter for temporary names beside dest (see copy_file, link_into_place)
+_tmp_names = itertools.count()
+
+def copy_range(fsrc, fdst) -> bool:
+    """Copy all of fsrc into fdst in-kernel with os.copy_file_range; False if it can't finish.
+
+    On XFS/Btrfs the kernel may reflink instead of copying, and NFS 4.2 copies
+    server-side. Returns False where copy_file_range is missing (non-Linux), refused
+    (ENOSYS, EXDEV, ...) or stops short, so the caller copies the bytes itself.
+    """
+    if not hasattr(os, "copy_file_range"):
+        return False
+    size = os.fstat(fsrc.fileno()).st_size
+    offset = 0
+    try:
+        while offset < size:
+            sent = os.copy_file_range(fsrc.fileno(), fdst.fileno(), size - offset, offset, offset)
+            if not sent:
+                return False  # e.g. source truncated underneath us
+            offset += sent
+    except OSError:
+        return False
+    return True
+
+def copy_to_new(src: str, dest: str):
+    """Copy src to dest like shutil.copy2 (data, mode, timestamps); dest must not exist yet."""
+    with open(src, "rb", buffering=0) as fsrc, open(dest, "xb", buffering=0) as fdst:
+        if not copy_range(fsrc, fdst):
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst)
+    shutil.copystat(src, dest)
+
+def copy_file(src: str, dest: str):
+    """Copy src to dest as a new file (see copy_to_new).
+
+    An existing dest (e.g. a symlink or hard link to src left by an earlier
+    symlink-mode run) is never opened for writing: the copy is made under a
+    temporary name beside it and renamed over it.
+    """
+    try:
+        copy_to_new(src, dest)
+        return
+    except FileExistsError:
+        pass
+    tmp = f"{dest}.tmp{os.getpid()}.{next(_tmp_names)}"
+    try:
+        copy_to_new(src, tmp)
+        os.replace(tmp, dest)
+    finally:
+        if os.path.lexists(tmp):
+            os.unlink(tmp)
+
+def link_into_place(src, dest, hard: bool = False):
+    """Link dest to src (hard link if `hard`, else symlink), replacing any existing dest.
+
+    On a rerun over an existing staging tree the link is made under a temporary name
+    beside dest and renamed over it, so there is no unlink/create window to race.
+    """
+    make_link = os.link if hard else os.symlink
+    try:
+        make_link(src, dest)
+        return
+    except FileExistsError:
+        pass
+    tmp = f"{dest}.tmp{os.getpid()}.{next(_tmp_names)}"
+    make_link(src, tmp)
+    try:
+        os.replace(tmp, dest)
+    finally:
+        # rename() leaves both names in place when they already link the same file
+        if os.path.lexists(tmp):
+            os.unlink(tmp)
+
+@functools.lru_cache(maxsize=None)
+def cp_has_reflink() -> bool:
+    """Whether cp accepts --reflink (GNU coreutils; not macOS/BSD cp). Probed once per run."""
+    try:
+        return subprocess.run(["cp", "--reflink=auto", "--help"], capture_output=True).returncode == 0
+    except OSError:
+        return False
+
+def reflink_file(src: str, dest: str):
+    """Copy-on-write clone via `cp --reflink=auto` (copy_file where cp has no --reflink).
+
+    As in copy_file, an existing dest is replaced, never written through.
+    """
+    if not cp_has_reflink():
+        copy_file(src, dest)
+        return
+    target = dest
+    if os.path.lexists(dest):
+        target = f"{dest}.tmp{os.getpid()}.{next(_tmp_names)}"
+    try:
+        result = subprocess.run(["cp", "--reflink=auto", "--preserve=mode,timestamps", src, target],
+                                capture_output=True, text=True)
+        if result.returncode:
+            raise OSError(f"cp --reflink failed: {result.stderr.strip()}")
+        if target != dest:
+            os.replace(target, dest)
+    finally:
+        if target != dest and os.path.lexists(target):
+            os.unlink(target)
+
+def symlink_file(src: str, dest: str):
+    link_into_place(src, dest)
+
+def hardlink_file(src: str, dest: str):
+    """Hard link in symlink mode when staging shares a filesystem with --input: it costs
+    no space, needs no dereference, and rsync sends it as a regular file."""
+    try:
+        link_into_place(src, dest, hard=True)
+    except OSError:
+        link_into_place(src, dest)  # no hard link support (e.g. exFAT cards); use a symlink
+
+def plan_file(src: str, dest: str):
+    pass  # plan: nothing placed, just recorded
+
+# How each --mode places a file (symlink mode uses hardlink_file on a shared filesystem)
+PLACE_FUNCS = {"symlink": symlink_file, "copy": copy_file, "reflink": reflink_file, "plan": plan_file}
+
+def scan_files(path):
+    """List all files under path (see iter_files), fetching each one's stat up front.
+
+    DirEntry caches the stat result, so later entry.stat() calls are free. Run on
+    a thread per device, this overlaps listing/stat latency on SD cards and mounts.
+    """
+    entries = []
+    for entry in iter_files(path):
+        try:
+            entry.stat()
+        except OSError:
+            pass  # left for the caller, which records blank size/mtime
+        entries.append(entry)
+    return entries
+
 def discover_devices(input_dir: Path):
     """Return list of (device_path, device_label, device_type).
 
@@ -80,10 +486,12 @@ def discover_devices(input_dir: Path):
     when constructing inventory rows later in `main()`.
     """
     devices = []
-    for child in sorted(input_dir.iterdir()):
-        if not child.is_dir():
-            continue
-        name = child.name
+    # scandir reports each entry's type from the directory listing (no stat per child)
+    with os.scandir(input_dir) as it:
+        entries = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+    for entry in entries:
+        child = Path(entry.path)
+        name = entry.name
         if name.lower().startswith(DEVICE_PREFIXES) or any(name.lower().startswith(p) for p in [p.lower() for p in DEVICE_PREFIXES]):
             label = norm_device_label(name)
             devices.append((child, label, guess_device_type(label)))
@@ -95,25 +503,34 @@ def discover_devices(input_dir: Path):
         print(f"[WARN] No device subfolders found under {input_dir}")
     return devices
 
+def iso_utc(timestamp: float) -> str:
+    """Format a POSIX timestamp as UTC ISO 8601, matching
+    datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat() without building a datetime.
+    """
+    # Same microsecond rounding (half-even, carried into seconds) as datetime.fromtimestamp
+    frac, secs = math.modf(timestamp)
+    us = round(frac * 1e6)
+    if us >= 1000000:
+        secs += 1
+        us -= 1000000
+    elif us < 0:
+        secs -= 1
+        us += 1000000
+    tm = time.gmtime(secs)
+    stamp = f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}T{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}"
+    return f"{stamp}.{us:06d}+00:00" if us else f"{stamp}+00:00"
+
 def make_staging_root(staging_base: Path, sdsC_root: Path, year: str, reserve: str, site: str, deployment: str) -> Path:
     # Matches /<SDSC-root>/<year>/<reserve>/<site>/<Deployment_deployid>/
     dep_dirname = f"Deployment_{deployment}"
     return staging_base.joinpath(sdsC_root, year, reserve, site, dep_dirname)
 
-def safe_relpath(path: Path, start: Path) -> str:
-    try:
-        return str(path.relative_to(start))
-    except Exception:
-        return str(path)
-
-def determine_media_class(p: Path) -> str:
-    # Classify files into a coarse media type used in metadata
-    # (written to `media_class` in the inventory CSV).
-    ext = p.suffix.lower()
-    if ext in IMAGE_EXTS: return "image"
-    if ext in AUDIO_EXTS: return "audio"
-    if ext in VIDEO_EXTS: return "video"
-    return "other"
+def positive_int(value: str) -> int:
+    # argparse type for counts that must be at least 1
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return n
 
 def build_argparser():
     ap = argparse.ArgumentParser(description="Prepare a field import for SDSC staging (tree + inventories).")
@@ -123,21 +540,52 @@ def build_argparser():
     ap.add_argument("--deployment", required=True, help="Deployment identifier (e.g., 20250905)")
     ap.add_argument("--staging", required=True, help="Local staging base directory")
     ap.add_argument("--sdsC-root", default="/expanse/projects/ucnrs-ssn/raw", help="SDSC root under which data will live")
-    ap.add_argument("--mode", choices=["symlink", "copy", "plan"], default="symlink", help="Place files as symlinks (default), copy, or plan-only")
-    ap.add_argument("--compute-hash", action="store_true", help="Compute SHA-256 for all files (slower). If off, writes inventory without checksums.")
+    ap.add_argument("--mode", choices=["symlink", "copy", "reflink", "plan"], default="symlink", help="Place files as symlinks (default; hard links on the same filesystem), copy, reflink (copy-on-write clone), or plan-only")
+    ap.add_argument("--compute-hash", action="store_true", help="Compute checksums for all files (slower): BLAKE3 if installed, else SHA-256. If off, writes inventory without checksums.")
+    # --legacy-hash is shorthand for --hash-algo sha256, so the two can't be combined
+    hash_algo_group = ap.add_mutually_exclusive_group()
+    hash_algo_group.add_argument("--hash-algo", choices=sorted(HASH_FILE_FUNCS), default=None, help="Checksum algorithm for --compute-hash: blake3 (manifest_blake3.txt, 'b3sum -c') or sha256 (manifest_sha256.txt, 'shasum -c'). Default: blake3 if installed, else sha256")
+    hash_algo_group.add_argument("--legacy-hash", action="store_true", help="Same as --hash-algo sha256")
+    ap.add_argument("--hash-workers", type=positive_int, default=None, help="Parallel hashing workers (default: min(32, 4 x CPUs)); lower this on slow SD card readers")
+    ap.add_argument("--hash-cache", default=None, help="SQLite file of digests from earlier runs; unchanged files (same path, inode, size, mtime) are not re-hashed. Not used on FAT/exFAT cards")
+    ap.add_argument("--io-backend", choices=["auto", "sync", "uring"], default="auto", help="Read path for hashing: 'uring' batches reads through io_uring (Linux + liburing<2026), 'sync' uses hashing threads; 'auto' (default) is currently the same as 'sync'")
     ap.add_argument("--rsync-user", default="your_username", help="Your SDSC login (for rsync cmd hint)")
     ap.add_argument("--rsync-host", default="expanse.sdsc.edu", help="SDSC host (for rsync cmd hint)")
     return ap
 
 def main():
     args = build_argparser().parse_args()
+    # Single timestamp for the whole run (UTC)
+    run_ts = datetime.now(timezone.utc)
     input_dir = Path(args.input).expanduser().resolve()
     if not input_dir.exists():
         print(f"[ERR] Input not found: {input_dir}")
         sys.exit(1)
 
+    # Manifest hash: BLAKE3 unless SHA-256 was requested or blake3 is not installed
+    hash_algo = "sha256" if args.legacy_hash else args.hash_algo
+    if args.compute_hash and hash_algo == "blake3" and blake3 is None:
+        print("[ERR] --hash-algo blake3 needs the blake3 package (pip install blake3)")
+        sys.exit(1)
+    if hash_algo is None:
+        hash_algo = "sha256" if blake3 is None else "blake3"
+        if args.compute_hash and blake3 is None:
+            print("[WARN] blake3 not installed (pip install blake3); using SHA-256")
+    uring_available = (liburing is not None and sys.platform == "linux"
+                       and all(hasattr(liburing, name) for name in URING_API))
+    if args.compute_hash and args.io_backend == "uring" and not uring_available:
+        print('[ERR] --io-backend uring needs Linux and the 2024.x liburing bindings (pip install "liburing<2026")')
+        sys.exit(1)
+    hash_cache = None
+    if args.compute_hash and args.hash_cache:
+        try:
+            hash_cache = open_hash_cache(Path(args.hash_cache).expanduser())
+        except sqlite3.Error as e:
+            print(f"[ERR] Cannot open hash cache {args.hash_cache}: {e}")
+            sys.exit(1)
+
     # Derive year safely from deployment if YYYYMMDD
-    year = args.deployment[:4] if len(args.deployment) >= 4 and args.deployment[:4].isdigit() else datetime.now().strftime("%Y")
+    year = args.deployment[:4] if len(args.deployment) >= 4 and args.deployment[:4].isdigit() else run_ts.astimezone().strftime("%Y")
 
     staging_base = Path(args.staging).expanduser().resolve()
     sdsC_root = Path(args.sdsC_root.strip("/"))  # treat as path segments under staging_base
@@ -153,54 +601,113 @@ def main():
         print("[WARN] No device folders found; exiting.")
         return
 
-    # In-memory collection of per-file metadata rows for the inventory CSV
-    inventory_rows = []
-    # Lines of the checksum manifest ("<sha256>  ./<relative_path>")
-    manifest_lines = []
+    # Hard links are only possible when input and staging share a filesystem
+    same_fs = args.mode == "symlink" and os.stat(input_dir).st_dev == os.stat(staging_root).st_dev
+    # Bind the placement function once instead of dispatching on --mode per file
+    place = hardlink_file if same_fs else PLACE_FUNCS[args.mode]
+
+    # (digest, staged relative path) pairs for the checksum manifest
+    manifest_pairs = []
+    # (source, staged relative path, stat or None if not cacheable) per file to hash, in walk order
+    hash_jobs = []
+    # Digest (or exception) per hash_jobs index, filled from the cache and the hashers
+    digests = {}
+    # hash_jobs indexes that missed the cache and are actually read
+    todo = []
     dup_check = set()
+    # Staging directories already created, so each is mkdir'd once
+    made_dirs = set()
     problems = 0
-
-    for device_path, device_label, device_type in devices:
-        dest_device_dir = staging_root.joinpath(device_label)
-        dest_device_dir.mkdir(parents=True, exist_ok=True)
-
-        # Walk files under device and build metadata for each file
-        for root, _, files in os.walk(device_path):
-            root_p = Path(root)
-            for fname in files:
-                src = root_p / fname
-                if not src.is_file():
-                    continue
+    files_written = 0
+
+    # Hashing: threads hash files while the walk runs, fed through a bounded queue so
+    # placement I/O and hashing overlap; batched io_uring reads after the walk only
+    # when explicitly asked for with --io-backend uring
+    use_uring = args.compute_hash and args.io_backend == "uring"
+    hash_workers = args.hash_workers if args.hash_workers is not None else min(32, (os.cpu_count() or 1) * 4)
+    hash_queue = None
+    hash_threads = []
+    if args.compute_hash and not use_uring:
+        hash_queue = queue.Queue(maxsize=HASH_QUEUE_DEPTH)
+        hash_threads = [threading.Thread(target=hash_worker, daemon=True,
+                                         args=(hash_queue, digests, HASH_FILE_FUNCS[hash_algo]))
+                        for _ in range(hash_workers)]
+        for t in hash_threads:
+            t.start()
+
+    # Ingest context is the same for every inventory row; bind it once outside the walk
+    reserve, site, deployment = args.reserve, args.site, args.deployment
+    ext_to_class, splitext = EXT_TO_CLASS.get, os.path.splitext
+    # Rows whose fields need no quoting are written as a pre-joined line (identical to
+    # csv.writer's output); only the source path varies per file and needs a check
+    needs_quote = NEEDS_QUOTE.search
+    context_safe = not any(needs_quote(v) for v in (reserve, site, deployment))
+    context_csv = f"{reserve},{site},{deployment}"
+
+    # Inventory CSV (one row per file with all metadata fields), written as the walk goes
+    # so rows are not held in memory and a partial run still leaves a readable file
+    inv_path = staging_root / "file_inventory.csv"
+    with inv_path.open("w", newline="", buffering=WRITE_BUFSIZE) as inv_file, \
+            ThreadPoolExecutor(max_workers=min(16, len(devices))) as scan_pool:
+        inv_writer = csv.writer(inv_file)
+        inv_writer.writerow(INVENTORY_FIELDS)
+
+        # Scan all device folders concurrently; results arrive in device order
+        device_files = scan_pool.map(scan_files, [device_path for device_path, _, _ in devices])
+
+        for (device_path, device_label, device_type), entries in zip(devices, device_files):
+            dest_device_dir = os.path.join(staging_root, device_label)
+            os.makedirs(dest_device_dir, exist_ok=True)
+            made_dirs.add(dest_device_dir)
+            # scandir paths are "<device_path><sep><subpath>", so the subpath is a slice
+            # and staged paths are plain string joins (no Path objects per file)
+            src_prefix_len = len(str(device_path)) + 1
+            dest_prefix = dest_device_dir + os.sep
+            rel_prefix = device_label + os.sep
+            # device_type and the computed columns never contain quote characters
+            device_safe = context_safe and not needs_quote(device_label)
+            # Only trust --hash-cache where inode numbers survive remounts and card swaps
+            use_cache = hash_cache is not None
+            if use_cache:
+                fstype = mount_fstype(device_path)
+                if fstype in UNSTABLE_INODE_FS:
+                    print(f"[WARN] --hash-cache not used for {device_path}: {fstype} has no stable inode numbers")
+                    use_cache = False
+
+            # Build metadata for each file under the device
+            for entry in entries:
+                fname = entry.name
+                src = entry.path  # str straight from the DirEntry; hashing and the CSV take it as is
 
                 # Within device, preserve relative subpath (if any)
-                rel_under_device = src.relative_to(device_path)
-                dest = dest_device_dir / rel_under_device
+                rel_under_device = src[src_prefix_len:]
+                dest = dest_prefix + rel_under_device
 
                 # ensure parent exists
-                dest.parent.mkdir(parents=True, exist_ok=True)
-
-                # plan/copy/symlink
-                if args.mode == "copy":
-                    shutil.copy2(src, dest)
-                elif args.mode == "symlink":
-                    # If dest exists, remove and relink
-                    if dest.exists():
-                        dest.unlink()
-                    os.symlink(src, dest)
-                elif args.mode == "plan":
-                    pass  # just record
+                dest_parent = os.path.dirname(dest)
+                if dest_parent not in made_dirs:
+                    os.makedirs(dest_parent, exist_ok=True)
+                    made_dirs.add(dest_parent)
+
+                # plan/copy/reflink/symlink
+                try:
+                    place(src, dest)
+                except OSError as e:
+                    print(f"[ERR] Could not place {src}: {e}")
+                    problems += 1
 
                 # Collect per-file metadata for the inventory
                 try:
-                    stat = src.stat()
+                    stat = entry.stat()
                     size_b = stat.st_size  # file size (bytes)
-                    mtime_iso = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat()  # last modified (UTC ISO8601)
+                    mtime_iso = iso_utc(stat.st_mtime)  # last modified (UTC ISO8601)
                 except Exception:
+                    stat = None
                     size_b = ""
                     mtime_iso = ""
 
                 # Stable relative path recorded in metadata and used in manifest
-                relpath_from_staging_root = safe_relpath(dest if args.mode != "plan" else dest, staging_root)
+                relpath_from_staging_root = rel_prefix + rel_under_device
 
                 # simple duplicate detection by (device_label, original filename)
                 key = (device_label, fname)
@@ -208,69 +715,112 @@ def main():
                     print(f"[WARN] Duplicate filename in same device: {fname} (device {device_label})")
                 dup_check.add(key)
 
-                # Coarse media type saved as `media_class` in the inventory
-                media_class = determine_media_class(src)
-
-                # The inventory row (per-file metadata written to CSV)
-                row = {
-                    "relative_path": relpath_from_staging_root,  # where the file lands under the staging root
-                    "device_label": device_label,                 # normalized device identifier (e.g., CAM01, ARU03)
-                    "device_type": device_type,                   # inferred type (camera/aru/unknown)
-                    "media_class": media_class,                   # coarse type (image/audio/video/other)
-                    "size_bytes": size_b,                         # file size in bytes
-                    "mtime_utc": mtime_iso,                       # last modified time in UTC ISO8601
-                    "reserve": args.reserve,                      # ingest context: reserve code
-                    "site": args.site,                            # ingest context: site code
-                    "deployment": args.deployment,                # ingest context: deployment id
-                    "source_abspath": str(src),                   # provenance: original absolute source path
-                }
-                inventory_rows.append(row)
-
-                if args.compute_hash and src.is_file():
-                    try:
-                        digest = sha256_file(src)  # per-file content hash for integrity verification
-                        # Record a manifest entry pairing hash with the staged relative path
-                        manifest_lines.append(f"{digest}  ./{relpath_from_staging_root}")
-                    except Exception as e:
-                        print(f"[ERR] Hash failed for {src}: {e}")
-                        problems += 1
-
-    # Write the inventory CSV (one row per file with all metadata fields)
-    inv_path = staging_root / "file_inventory.csv"
-    inv_fields = [
-        "relative_path", "device_label", "device_type", "media_class",
-        "size_bytes", "mtime_utc", "reserve", "site", "deployment", "source_abspath"
-    ]
-    with inv_path.open("w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=inv_fields)
-        w.writeheader()
-        w.writerows(inventory_rows)
-
-    # Write checksum manifest if requested (for later `shasum -c` verification)
+                # Coarse media type (image/audio/video/other) saved as `media_class` in the inventory
+                media_class = ext_to_class(splitext(fname)[1].lower(), "other")
+
+                # The inventory row (per-file metadata written to CSV, in INVENTORY_FIELDS order)
+                if device_safe and not needs_quote(src):  # the staged relpath is a suffix of src
+                    inv_file.write(f"{relpath_from_staging_root},{device_label},{device_type},{media_class},"
+                                   f"{size_b},{mtime_iso},{context_csv},{src}\r\n")
+                else:
+                    inv_writer.writerow((
+                        relpath_from_staging_root,  # relative_path: where the file lands under the staging root
+                        device_label,               # device_label: normalized device identifier (e.g., CAM01, ARU03)
+                        device_type,                # device_type: inferred type (camera/aru/unknown)
+                        media_class,                # media_class: coarse type (image/audio/video/other)
+                        size_b,                     # size_bytes: file size in bytes
+                        mtime_iso,                  # mtime_utc: last modified time in UTC ISO8601
+                        reserve,                    # reserve: ingest context: reserve code
+                        site,                       # site: ingest context: site code
+                        deployment,                 # deployment: ingest context: deployment id
+                        src,                        # source_abspath: provenance: original absolute source path
+                    ))
+                files_written += 1
+
+                if args.compute_hash:
+                    idx = len(hash_jobs)
+                    # st_ino is 0 from DirEntry.stat() on Windows, so no identity to check there
+                    cache_stat = stat if use_cache and stat is not None and stat.st_ino else None
+                    hash_jobs.append((src, relpath_from_staging_root, cache_stat))
+                    digest = None
+                    if cache_stat is not None:
+                        digest = cached_digest(hash_cache, src, cache_stat, hash_algo)
+                    if digest is not None:
+                        digests[idx] = digest
+                    else:
+                        todo.append(idx)
+                        if hash_queue is not None:
+                            hash_queue.put((idx, src))
+
+    # Let the hashing threads drain the queue and exit
+    for _ in hash_threads:
+        hash_queue.put(None)
+    for t in hash_threads:
+        t.join()
+
+    if use_uring and todo:
+        todo_srcs = [hash_jobs[i][0] for i in todo]
+        try:
+            new_digests = hash_files_iouring(todo_srcs, HASH_CONSTRUCTORS[hash_algo])
+        except Exception as e:
+            print(f"[WARN] io_uring hashing unavailable ({e}); falling back to thread pool")
+            new_digests = hash_files_threaded(todo_srcs, HASH_FILE_FUNCS[hash_algo], hash_workers)
+        digests.update(zip(todo, new_digests))
+
+    if hash_jobs:
+        if hash_cache is not None and todo:
+            store_digests(hash_cache, [
+                (src, hash_algo, stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, digests[i])
+                for i in todo
+                for src, _, stat in (hash_jobs[i],)
+                if stat is not None and not isinstance(digests[i], Exception)
+            ])
+
+        for idx, (src, relpath, _) in enumerate(hash_jobs):
+            digest = digests[idx]
+            if isinstance(digest, Exception):
+                print(f"[ERR] Hash failed for {src}: {digest}")
+                problems += 1
+                continue
+            # Record a manifest entry pairing hash with the staged relative path
+            manifest_pairs.append((digest, relpath))
+
+    if hash_cache is not None:
+        hash_cache.close()
+
+    # Write checksum manifest if requested (for later `b3sum -c` / `shasum -c` verification)
     if args.compute_hash:
-        man_path = staging_root / "manifest_sha256.txt"
-        with man_path.open("w") as mf:
-            mf.write("\n".join(manifest_lines) + ("\n" if manifest_lines else ""))
+        man_path = staging_root / f"manifest_{hash_algo}.txt"
+        with man_path.open("w", buffering=WRITE_BUFSIZE) as mf:
+            # Stream lines through the buffered writer rather than joining one large string
+            mf.writelines(f"{digest}  ./{relpath}\n" for digest, relpath in manifest_pairs)
     else:
         man_path = None
 
     # Append a run-level metadata summary to the ingest log
     log_path = logs_dir / "ingest.log"
-    with log_path.open("a") as lf:
-        lf.write(f"[{datetime.now().isoformat()}] input={input_dir} reserve={args.reserve} site={args.site} deployment={args.deployment} mode={args.mode} files={len(inventory_rows)} problems={problems}\n")
+    log_line = f"[{run_ts.isoformat()}] input={input_dir} reserve={args.reserve} site={args.site} deployment={args.deployment} mode={args.mode} files={files_written} problems={problems}\n"
+    # One write() on an O_APPEND descriptor: the kernel moves to end-of-file and writes in a
+    # single step, so lines from concurrent ingest runs never interleave (local filesystems; not NFS)
+    fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, log_line.encode())
+    finally:
+        os.close(fd)
 
     print("\n✅ Staging prepared at:")
     print(f"   {staging_root}")
     print(f"   Inventory: {inv_path}")
     if man_path:
         print(f"   Manifest:  {man_path}")
-        print("   Verify later with:  shasum -c manifest_sha256.txt")
+        verify_cmd = "b3sum -c" if hash_algo == "blake3" else "shasum -c"
+        print(f"   Verify later with:  {verify_cmd} {man_path.name}")
 
     # print suggested rsync command
     remote_path = f"/expanse/projects/ucnrs-ssn/raw/{year}/{args.reserve}/{args.site}/Deployment_{args.deployment}/"
     print("\n📤 Suggested upload command (rsync):")
     print(f'rsync -avh --info=progress2 "{staging_root}/" {args.rsync_user}@{args.rsync_host}:"{remote_path}"')
-    print("\n(Review the staged tree first; if you used --mode symlink, rsync will follow symlinks as regular files by default on macOS rsync 2.6.9; if needed, add --copy-links)\n")
+    print("\n(Review the staged tree first; if you used --mode symlink across filesystems, rsync will follow symlinks as regular files by default on macOS rsync 2.6.9; if needed, add --copy-links)\n")
 
 if __name__ == "__main__":
     main()